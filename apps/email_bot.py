@@ -1,30 +1,115 @@
 from core.config import email_config
 import smtplib
 import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.application import MIMEApplication
+import html
+from email import policy
+from email.message import EmailMessage
 import logging
 import asyncio
+import time
+from collections import defaultdict
+from contextlib import AsyncExitStack
 from pathlib import Path
-from urllib.parse import urlparse
+from services.rss.manager import parse_url
 
+# 连接池: (smtp_server, smtp_port, username) -> {"server": SMTP, "last_used": 时间戳}
 email_clients = {}
+email_clients_lock = asyncio.Lock()
+
+# 由 startup 创建，close_all 时统一释放连接池等资源
+_stack: AsyncExitStack | None = None
+
+# 空闲超过该秒数的连接会被清理任务关闭
+MAX_IDLE_SECONDS = 100
+
+# 定时任务中同时下载的sitemap数量上限
+MAX_CONCURRENT_DOWNLOADS = 8
+
+# 定时任务中单个订阅源的处理超时时间（秒）
+FEED_TIMEOUT_SECONDS = 120
+
+# 域名 -> 锁。同一域名的订阅源共用存储目录，超时的下载线程可能延续到下一轮，
+# 因此锁在多轮检查之间共享
+_domain_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+# 等待超时线程结束的后台任务，保存引用避免被垃圾回收
+_background_tasks: set[asyncio.Task] = set()
+
+# 合并通知邮件的附件总大小上限，超出部分不再附加，避免超过SMTP服务器的邮件大小限制
+MAX_ATTACHMENTS_BYTES = 20 * 1024 * 1024
+
+# 所有连接共用的TLS上下文，避免每次连接都重新加载系统证书
+_SSL_CTX = ssl.create_default_context()
+
+_HELP_HTML = """
+    <h2>Email Bot Help</h2>
+    <p>这是一个基于邮件的sitemap监控机器人。</p>
+    <h3>功能：</h3>
+    <ul>
+        <li>监控sitemap更新</li>
+        <li>发送更新通知邮件</li>
+        <li>关键词汇总</li>
+    </ul>
+    <h3>配置：</h3>
+    <p>请确保正确配置了以下环境变量：</p>
+    <ul>
+        <li>EMAIL_SMTP_SERVER: SMTP服务器地址</li>
+        <li>EMAIL_SMTP_PORT: SMTP端口（默认587）</li>
+        <li>EMAIL_USERNAME: 邮箱用户名</li>
+        <li>EMAIL_PASSWORD: 邮箱密码</li>
+        <li>EMAIL_FROM: 发件人邮箱（可选，默认使用用户名）</li>
+        <li>EMAIL_TO: 收件人邮箱</li>
+        <li>EMAIL_USE_TLS: 是否使用TLS（默认true）</li>
+    </ul>
+    """
+
+_HTML_HEADER = """
+        <html>
+        <body>
+        """
+
+_HTML_FOOTER = """
+            <hr>
+            <p><em>自动发送 by Email Bot</em></p>
+        </body>
+        </html>
+        """
+
+_UPDATE_HEADER_TMPL = """
+            <h2>✨ {domain} ✨</h2>
+            <hr>
+            <p><strong>来源:</strong> {url}</p>
+        """
+
+_UPDATE_NEW_URLS_TMPL = """
+            <p><strong>发现新增内容！</strong> (共 {count} 条)</p>
+            <ul>
+            """
+
+_UPDATE_NO_CHANGE = "<p><strong>今日sitemap无更新</strong></p>"
+
+_SUMMARY_HEADER = """
+            <h2>🎯 #今日新增 #关键词 #速览 🎯</h2>
+            <hr>
+        """
 
 
 def create_email_client():
     """创建邮件客户端连接"""
+    server = None
     try:
-        context = ssl.create_default_context()
-        server = smtplib.SMTP(email_config["smtp_server"], email_config["smtp_port"])
+        server = smtplib.SMTP(email_config.smtp_server, email_config.smtp_port)
         
-        if email_config["use_tls"]:
-            server.starttls(context=context)
+        if email_config.use_tls:
+            server.starttls(context=_SSL_CTX)
         
-        server.login(email_config["username"], email_config["password"])
+        server.login(email_config.username, email_config.password)
         return server
     except Exception as e:
         logging.error(f"创建邮件客户端失败: {str(e)}")
+        # 连接已建立但TLS或登录失败时，关闭底层socket
+        if server:
+            server.close()
         return None
 
 
@@ -37,74 +122,108 @@ def close_email_client(server):
         logging.error(f"关闭邮件客户端失败: {str(e)}")
 
 
+def _get_or_create_client():
+    """从连接池获取邮件客户端，连接失效时重新创建
+
+    调用方需持有 email_clients_lock
+    """
+    key = (email_config.smtp_server, email_config.smtp_port, email_config.username)
+    entry = email_clients.get(key)
+    if entry:
+        server = entry["server"]
+        try:
+            server.noop()
+            entry["last_used"] = time.monotonic()
+            return server
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPException, OSError):
+            logging.info("邮件客户端连接已失效，正在重新连接")
+            email_clients.pop(key, None)
+            close_email_client(server)
+
+    server = create_email_client()
+    if server:
+        email_clients[key] = {"server": server, "last_used": time.monotonic()}
+    return server
+
+
+def _discard_client(server):
+    """从连接池中移除并关闭指定的邮件客户端"""
+    for key, entry in list(email_clients.items()):
+        if entry["server"] is server:
+            email_clients.pop(key, None)
+    close_email_client(server)
+
+
 async def send_email(subject: str, body: str, attachments: list = None):
     """发送邮件"""
-    if not email_config["to_email"]:
+    if not email_config.to_email:
         logging.error("未配置邮件接收地址，请检查EMAIL_TO环境变量")
         return False
     
-    server = create_email_client()
-    if not server:
-        return False
-    
+    # smtplib 是阻塞的，放到线程中执行以免阻塞事件循环
+    async with email_clients_lock:
+        server = await asyncio.to_thread(_get_or_create_client)
+        if not server:
+            return False
+        return await asyncio.to_thread(
+            _send_with_client, server, subject, body, attachments
+        )
+
+
+def _send_with_client(server, subject: str, body: str, attachments: list = None):
+    """使用已建立的连接发送邮件"""
     try:
-        msg = MIMEMultipart()
-        msg["From"] = email_config["from_email"] or email_config["username"]
-        msg["To"] = email_config["to_email"]
+        msg = EmailMessage(policy=policy.SMTP)
+        msg["From"] = email_config.from_email or email_config.username
+        msg["To"] = email_config.to_email
         msg["Subject"] = subject
         
-        # 添加正文
-        msg.attach(MIMEText(body, "html"))
+        # 添加正文，纯文本部分供不支持HTML的客户端显示
+        msg.set_content("请使用支持HTML的邮件客户端查看此邮件。")
+        msg.add_alternative(body, subtype="html")
         
         # 添加附件
-        if attachments:
-            for attachment in attachments:
-                if isinstance(attachment, Path) and attachment.exists():
-                    with open(attachment, "rb") as f:
-                        part = MIMEApplication(f.read(), Name=attachment.name)
-                    part["Content-Disposition"] = f"attachment; filename=\"{attachment.name}\""
-                    msg.attach(part)
+        for attachment in attachments or []:
+            if not isinstance(attachment, Path):
+                continue
+            try:
+                data = attachment.read_bytes()
+            except FileNotFoundError:
+                # 文件可能已被删除，跳过该附件
+                continue
+            msg.add_attachment(
+                data,
+                maintype="application",
+                subtype="octet-stream",
+                filename=attachment.name,
+            )
         
         # 发送邮件
         server.send_message(msg)
         logging.info(f"邮件发送成功: {subject}")
         return True
+    except (smtplib.SMTPServerDisconnected, OSError) as e:
+        # 连接已断开，移出连接池以便下次发送时重新连接
+        logging.error(f"发送邮件失败: {str(e)}")
+        _discard_client(server)
+        return False
     except Exception as e:
         logging.error(f"发送邮件失败: {str(e)}")
         return False
-    finally:
-        close_email_client(server)
 
 
 async def help_command():
     """帮助命令"""
-    help_text = """
-    <h2>Email Bot Help</h2>
-    <p>这是一个基于邮件的sitemap监控机器人。</p>
-    <h3>功能：</h3>
-    <ul>
-        <li>监控sitemap更新</li>
-        <li>发送更新通知邮件</li>
-        <li>关键词汇总</li>
-    </ul>
-    <h3>配置：</h3>
-    <p>请确保正确配置了以下环境变量：</p>
-    <ul>
-        <li>EMAIL_SMTP_SERVER: SMTP服务器地址</li>
-        <li>EMAIL_SMTP_PORT: SMTP端口（默认587）</li>
-        <li>EMAIL_USERNAME: 邮箱用户名</li>
-        <li>EMAIL_PASSWORD: 邮箱密码</li>
-        <li>EMAIL_FROM: 发件人邮箱（可选，默认使用用户名）</li>
-        <li>EMAIL_TO: 收件人邮箱</li>
-        <li>EMAIL_USE_TLS: 是否使用TLS（默认true）</li>
-    </ul>
-    """
-    return help_text
+    return _HELP_HTML
 
 
 async def init_task():
     """初始化任务"""
     logging.info("Initializing Email bot")
+    # 在日志配置完成后再提示，避免导入配置时触发默认的日志配置
+    if not email_config.to_email:
+        logging.warning("未配置邮件接收地址(EMAIL_TO)，邮件通知将不会发送")
+    await startup()
     
     # 发送初始化邮件
     help_text = await help_command()
@@ -117,13 +236,111 @@ async def start_task():
     return True
 
 
-def close_all():
+async def _close_pool():
+    """关闭连接池中的所有邮件客户端连接"""
+    async with email_clients_lock:
+        servers = [entry["server"] for entry in email_clients.values()]
+        email_clients.clear()
+        for server in servers:
+            await asyncio.to_thread(close_email_client, server)
+
+
+async def startup():
+    """创建资源栈，保证退出时连接池一定会被关闭"""
+    global _stack
+    _stack = AsyncExitStack()
+    _stack.push_async_callback(_close_pool)
+
+
+async def close_all():
     """关闭所有连接"""
+    global _stack
     logging.info("Closing Email bot")
-    # 关闭所有邮件客户端连接
-    for server in email_clients.values():
-        close_email_client(server)
-    email_clients.clear()
+    if _stack is None:
+        await _close_pool()
+        return
+    stack, _stack = _stack, None
+    await stack.aclose()
+
+
+async def idle_sweep_task(max_idle_seconds: int = MAX_IDLE_SECONDS):
+    """定期关闭空闲过久的邮件客户端连接"""
+    while True:
+        await asyncio.sleep(max_idle_seconds)
+        async with email_clients_lock:
+            now = time.monotonic()
+            for key, entry in list(email_clients.items()):
+                if now - entry["last_used"] >= max_idle_seconds:
+                    email_clients.pop(key, None)
+                    await asyncio.to_thread(close_email_client, entry["server"])
+                    logging.info(f"已关闭空闲邮件客户端连接: {key[0]}:{key[1]}")
+
+
+def _build_update_section(url: str, new_urls: list[str]) -> str:
+    """构建单个sitemap更新通知的HTML片段"""
+    parts = [
+        _UPDATE_HEADER_TMPL.format(
+            domain=html.escape(parse_url(url).netloc), url=html.escape(url)
+        )
+    ]
+
+    if new_urls:
+        parts.append(_UPDATE_NEW_URLS_TMPL.format(count=len(new_urls)))
+        for url_item in new_urls:
+            escaped = html.escape(url_item)
+            parts.append(f'<li><a href="{escaped}">{escaped}</a></li>')
+        parts.append("</ul>")
+    else:
+        parts.append(_UPDATE_NO_CHANGE)
+
+    return "".join(parts)
+
+
+def _build_keywords_section(all_new_urls: list[str]) -> str:
+    """从URL列表中提取关键词并按域名分组，构建HTML片段；没有关键词时返回空字符串"""
+    # 创建域名-关键词映射字典，使用集合自动去重
+    domain_keywords = defaultdict(set)
+
+    # 从URL中提取域名和关键词（路径最后一段），重复的URL只处理一次
+    try:
+        for url in dict.fromkeys(all_new_urls):
+            if not isinstance(url, str) or "://" not in url:
+                continue
+            parsed_url = parse_url(url)
+            keyword = parsed_url.path.rstrip("/").rpartition("/")[2].strip()
+            if keyword:
+                domain_keywords[parsed_url.netloc].add(keyword)
+    except Exception as e:
+        logging.error(f"从URL提取关键词失败: {str(e)}")
+
+    if not domain_keywords:
+        return ""
+
+    parts = [_SUMMARY_HEADER]
+
+    # 按域名分组展示关键词
+    for domain, keywords in domain_keywords.items():
+        if keywords:  # 确保该域名有关键词
+            parts.append(f"<h3>📌 {html.escape(domain)}:</h3><ul>")
+            parts.extend(f"<li>{html.escape(keyword)}</li>" for keyword in keywords)
+            parts.append("</ul><br>")
+
+    return "".join(parts)
+
+
+def _unlink_many(paths: list[Path]) -> None:
+    """删除多个临时文件，单个文件删除失败不影响其他文件"""
+    for path in paths:
+        try:
+            path.unlink()
+            logging.info(f"已删除临时sitemap文件: {path}")
+        except OSError as e:
+            logging.error(f"删除文件失败: {path}, Error: {str(e)}")
+
+
+def _wrap_html(body: str) -> str:
+    """为HTML片段添加邮件的页头和页脚"""
+    return _HTML_HEADER + body + _HTML_FOOTER
 
 
 async def send_update_notification(
@@ -131,47 +348,26 @@ async def send_update_notification(
     new_urls: list[str],
     dated_file: Path | None,
     target_email: str = None,
+    delete_file: bool = True,
 ) -> None:
-    """发送Sitemap更新通知邮件，包括文件（如果可用）和新增URL列表。"""
-    email_to = target_email or email_config["to_email"]
+    """发送Sitemap更新通知邮件，包括文件（如果可用）和新增URL列表。
+
+    delete_file 为 False 时发送后保留 dated_file，由调用方负责删除。
+    """
+    email_to = target_email or email_config.to_email
     if not email_to:
         logging.error("未配置邮件接收地址，请检查EMAIL_TO环境变量")
         return
     
-    domain = urlparse(url).netloc
+    domain = parse_url(url).netloc
+    has_file = bool(dated_file and dated_file.exists())
     
     try:
         # 构建HTML邮件内容
-        html_content = f"""
-        <html>
-        <body>
-            <h2>✨ {domain} ✨</h2>
-            <hr>
-            <p><strong>来源:</strong> {url}</p>
-        """
-        
-        if new_urls:
-            html_content += f"""
-            <p><strong>发现新增内容！</strong> (共 {len(new_urls)} 条)</p>
-            <ul>
-            """
-            for url_item in new_urls:
-                html_content += f'<li><a href="{url_item}">{url_item}</a></li>'
-            html_content += "</ul>"
-        else:
-            html_content += "<p><strong>今日sitemap无更新</strong></p>"
-        
-        html_content += """
-            <hr>
-            <p><em>自动发送 by Email Bot</em></p>
-        </body>
-        </html>
-        """
+        html_content = _wrap_html(_build_update_section(url, new_urls))
         
         # 准备附件
-        attachments = []
-        if dated_file and dated_file.exists():
-            attachments.append(dated_file)
+        attachments = [dated_file] if has_file else []
         
         # 发送邮件
         subject = f"✨ {domain} Sitemap更新通知"
@@ -180,9 +376,9 @@ async def send_update_notification(
         if success:
             logging.info(f"已发送更新通知邮件 for {url}")
             # 发送成功后删除临时文件
-            if dated_file and dated_file.exists():
+            if has_file and delete_file:
                 try:
-                    dated_file.unlink()
+                    await asyncio.to_thread(dated_file.unlink)
                     logging.info(f"已删除临时sitemap文件: {dated_file}")
                 except OSError as e:
                     logging.error(f"删除文件失败: {dated_file}, Error: {str(e)}")
@@ -198,7 +394,7 @@ async def send_keywords_summary(
     target_email: str = None,
 ) -> None:
     """从URL列表中提取关键词并按域名分组发送汇总邮件"""
-    email_to = target_email or email_config["to_email"]
+    email_to = target_email or email_config.to_email
     if not email_to:
         logging.error("未配置邮件接收地址，请检查EMAIL_TO环境变量")
         return
@@ -206,57 +402,11 @@ async def send_keywords_summary(
     if not all_new_urls:
         return
     
-    # 创建域名-关键词映射字典
-    domain_keywords = {}
-    
-    # 从URL中提取域名和关键词
-    for url in all_new_urls:
-        try:
-            # 解析URL获取域名和路径
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc
-            
-            # 提取路径最后部分作为关键词
-            path_parts = parsed_url.path.rstrip("/").split("/")
-            if path_parts and path_parts[-1]:  # 确保有路径且最后部分不为空
-                keyword = path_parts[-1]
-                if keyword.strip():
-                    # 将关键词添加到对应域名的列表中
-                    if domain not in domain_keywords:
-                        domain_keywords[domain] = []
-                    domain_keywords[domain].append(keyword)
-        except Exception as e:
-            logging.debug(f"从URL提取关键词失败: {url}, 错误: {str(e)}")
-            continue
-    
-    # 对每个域名的关键词列表去重
-    for domain in domain_keywords:
-        domain_keywords[domain] = list(set(domain_keywords[domain]))
+    keywords_section = _build_keywords_section(all_new_urls)
     
     # 如果有关键词，构建并发送邮件
-    if domain_keywords:
-        # 构建HTML邮件内容
-        html_content = """
-        <html>
-        <body>
-            <h2>🎯 #今日新增 #关键词 #速览 🎯</h2>
-            <hr>
-        """
-        
-        # 按域名分组展示关键词
-        for domain, keywords in domain_keywords.items():
-            if keywords:  # 确保该域名有关键词
-                html_content += f"<h3>📌 {domain}:</h3><ul>"
-                for i, keyword in enumerate(keywords, 1):
-                    html_content += f"<li>{keyword}</li>"
-                html_content += "</ul><br>"
-        
-        html_content += """
-            <hr>
-            <p><em>自动发送 by Email Bot</em></p>
-        </body>
-        </html>
-        """
+    if keywords_section:
+        html_content = _wrap_html(keywords_section)
         
         # 发送汇总邮件
         subject = "🎯 今日新增关键词汇总"
@@ -268,6 +418,124 @@ async def send_keywords_summary(
             logging.error("发送关键词汇总邮件失败")
 
 
+async def send_batch_notification(
+    updates: list[tuple[str, list[str], Path | None]],
+    all_new_urls: list[str],
+    target_email: str = None,
+) -> None:
+    """将一轮检查中所有sitemap的更新通知和关键词汇总合并为一封邮件发送
+
+    Args:
+        updates: (sitemap URL, 新增URL列表, 带日期的文件路径) 的列表
+        all_new_urls: 本轮所有新增URL，用于生成关键词汇总
+        target_email: 收件地址，默认使用配置中的to_email
+    """
+    email_to = target_email or email_config.to_email
+    if not email_to:
+        logging.error("未配置邮件接收地址，请检查EMAIL_TO环境变量")
+        return
+
+    if not updates and not all_new_urls:
+        return
+
+    try:
+        parts = [_build_update_section(url, new_urls) for url, new_urls, _ in updates]
+        keywords_section = _build_keywords_section(all_new_urls)
+        if keywords_section:
+            parts.append(keywords_section)
+        if not parts:
+            return
+        html_content = _wrap_html("".join(parts))
+
+        # 文件由定时任务统一删除；缺失的文件跳过，总大小超出上限后不再附加
+        attachments = []
+        total_size = 0
+        for _, _, dated_file in updates:
+            if not dated_file:
+                continue
+            try:
+                size = dated_file.stat().st_size
+            except FileNotFoundError:
+                continue
+            if total_size + size > MAX_ATTACHMENTS_BYTES:
+                logging.warning(f"附件总大小超出上限，跳过附件: {dated_file}")
+                continue
+            attachments.append(dated_file)
+            total_size += size
+
+        subject = f"✨ Sitemap更新通知 (共 {len(updates)} 个订阅源)"
+        success = await send_email(subject, html_content, attachments)
+
+        if success:
+            logging.info(f"已发送合并更新通知邮件，共 {len(updates)} 个订阅源")
+        else:
+            logging.error("发送合并更新通知邮件失败")
+    except Exception as e:
+        logging.error(f"发送合并更新通知邮件失败: {str(e)}", exc_info=True)
+
+
+async def _release_when_done(future: asyncio.Future, lock: asyncio.Lock, url: str):
+    """等待超时的订阅源线程结束后释放域名锁，其带日期文件留给下一轮检查发送"""
+    try:
+        await future
+        logging.info(f"超时的订阅源 {url} 已完成，更新将在下一轮发送")
+    except Exception as e:
+        logging.warning(f"超时的订阅源 {url} 最终失败: {str(e)}")
+    finally:
+        lock.release()
+
+
+async def _check_feeds(rss_manager, feeds: list[str]) -> list:
+    """并发下载所有订阅源的sitemap
+
+    同一域名的订阅源共用一个存储目录，因此按域名串行处理。
+    单个订阅源失败或超时不会影响其他订阅源；超时的下载线程无法被取消，
+    其域名锁会一直保持到线程结束。
+
+    Returns:
+        list: 与 feeds 顺序对应的 add_feed 返回值或异常
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    results: list = [None] * len(feeds)
+
+    async def handle(index: int, url: str):
+        lock = _domain_locks[parse_url(url).netloc]
+        try:
+            await asyncio.wait_for(lock.acquire(), timeout=FEED_TIMEOUT_SECONDS)
+        except TimeoutError:
+            results[index] = TimeoutError("同域名的其他订阅源仍未完成")
+            return
+        release_later = False
+        try:
+            async with semaphore:
+                logging.info(f"正在检查订阅源: {url}")
+                # add_feed 内部会调用 download_sitemap，网络和磁盘操作放到线程中执行
+                future = asyncio.ensure_future(
+                    asyncio.to_thread(rss_manager.add_feed, url)
+                )
+                try:
+                    results[index] = await asyncio.wait_for(
+                        asyncio.shield(future), timeout=FEED_TIMEOUT_SECONDS
+                    )
+                except TimeoutError:
+                    results[index] = TimeoutError(f"超过 {FEED_TIMEOUT_SECONDS} 秒未完成")
+                    # 线程仍在写入该域名的文件，由后台任务等待其结束后再释放域名锁
+                    task = asyncio.create_task(_release_when_done(future, lock, url))
+                    _background_tasks.add(task)
+                    task.add_done_callback(_background_tasks.discard)
+                    release_later = True
+        except Exception as e:
+            results[index] = e
+        finally:
+            if not release_later:
+                lock.release()
+
+    async with asyncio.TaskGroup() as tg:
+        for index, url in enumerate(feeds):
+            tg.create_task(handle(index, url))
+    return results
+
+
 async def scheduled_task():
     """定时任务"""
     await asyncio.sleep(5)
@@ -278,23 +546,37 @@ async def scheduled_task():
     while True:
         try:
             feeds = rss_manager.get_feeds()
-            logging.info(f"定时任务开始检查订阅源更新，共 {len(feeds)} 个订阅")
-            
-            # 用于存储所有新增的URL
-            all_new_urls = []
-            for url in feeds:
-                logging.info(f"正在检查订阅源: {url}")
-                # add_feed 内部会调用 download_sitemap
-                success, error_msg, dated_file, new_urls = rss_manager.add_feed(url)
+        except Exception as e:
+            logging.error(f"读取订阅源失败: {str(e)}", exc_info=True)
+            await asyncio.sleep(60)  # 出错后等待1分钟再试
+            continue
+        logging.info(f"定时任务开始检查订阅源更新，共 {len(feeds)} 个订阅")
+        
+        # 用于存储所有新增的URL
+        all_new_urls = []
+        # 本轮待合并发送的邮件通知
+        pending = []
+        results = await _check_feeds(rss_manager, feeds)
+        # 按订阅顺序依次发送通知
+        for url, result in zip(feeds, results):
+            if isinstance(result, Exception):
+                logging.warning(f"订阅源 {url} 更新失败: {str(result)}")
+                continue
+            try:
+                success, error_msg, dated_file, new_urls = result
                 
                 if success and dated_file.exists():
-                    # 使用新的通知系统
+                    # 邮件通知在本轮结束后合并发送，其他通知服务逐个发送；
+                    # 文件作为邮件附件，由合并发送负责删除
                     await notification_manager.send_to_all(
                         "send_update_notification",
                         url=url,
                         new_urls=new_urls,
-                        dated_file=dated_file
+                        dated_file=dated_file,
+                        delete_file=False,
+                        exclude=("email",),
                     )
+                    pending.append((url, new_urls, dated_file))
                     if new_urls:
                         logging.info(
                             f"订阅源 {url} 更新成功，发现 {len(new_urls)} 个新URL，已发送通知。"
@@ -307,13 +589,20 @@ async def scheduled_task():
                     logging.warning(f"订阅源 {url} 更新失败: {error_msg}")
                 # 将新URL添加到汇总列表中
                 all_new_urls.extend(new_urls)
-            
-            # 调用新封装的函数发送关键词汇总
-            await asyncio.sleep(10)  # 等待10秒，确保所有消息都发送完成
-            await send_keywords_summary(all_new_urls)
-            
-            logging.info("所有订阅源检查完成，等待下一次检查")
-            await asyncio.sleep(3600)  # 保持1小时检查间隔
-        except Exception as e:
-            logging.error(f"检查订阅源更新失败: {str(e)}", exc_info=True)
-            await asyncio.sleep(60)  # 出错后等待1分钟再试
\ No newline at end of file
+            except Exception as e:
+                logging.error(f"处理订阅源 {url} 失败: {str(e)}", exc_info=True)
+        
+        # 合并发送本轮无更新站点的汇总消息
+        await notification_manager.flush_digest()
+        
+        # 合并发送本轮的更新通知和关键词汇总
+        await asyncio.sleep(10)  # 等待10秒，确保所有消息都发送完成
+        await send_batch_notification(pending, all_new_urls)
+        # 无论邮件是否发送成功都删除本轮的临时文件；残留的带日期文件会被视为
+        # "今天已经更新过但没发送"，导致下一轮重复推送相同的更新
+        await asyncio.to_thread(
+            _unlink_many, [dated_file for _, _, dated_file in pending if dated_file]
+        )
+        
+        logging.info("所有订阅源检查完成，等待下一次检查")
+        await asyncio.sleep(3600)  # 保持1小时检查间隔
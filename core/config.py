@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from dotenv import load_dotenv
 import os
 
@@ -6,18 +7,34 @@ load_dotenv()
 telegram_config = {
     "token": os.environ.get("TELEGRAM_BOT_TOKEN", ""),
     "target_chat": os.environ.get("TELEGRAM_TARGET_CHAT"),  # 不设默认值，强制要求配置
+    # 是否在上传sitemap文件的同时发送新增URL，关闭后严格按顺序发送
+    "pipeline_sends": os.environ.get("TELEGRAM_PIPELINE_SENDS", "true").lower() == "true",
+    # 是否跳过无更新站点的单独通知，改为每轮合并发送一条汇总消息
+    "skip_empty": os.environ.get("TELEGRAM_SKIP_EMPTY", "false").lower() == "true",
 }
 
 discord_config = {
     "token": os.environ.get("DISCORD_TOKEN", ""),
 }
 
-email_config = {
-    "smtp_server": os.environ.get("EMAIL_SMTP_SERVER", ""),
-    "smtp_port": int(os.environ.get("EMAIL_SMTP_PORT", "587")),
-    "username": os.environ.get("EMAIL_USERNAME", ""),
-    "password": os.environ.get("EMAIL_PASSWORD", ""),
-    "from_email": os.environ.get("EMAIL_FROM", ""),
-    "to_email": os.environ.get("EMAIL_TO", ""),
-    "use_tls": os.environ.get("EMAIL_USE_TLS", "true").lower() == "true",
-}
+
+@dataclass(frozen=True, slots=True)
+class EmailConfig:
+    smtp_server: str
+    smtp_port: int
+    username: str
+    password: str
+    from_email: str
+    to_email: str
+    use_tls: bool
+
+
+email_config = EmailConfig(
+    smtp_server=os.environ.get("EMAIL_SMTP_SERVER", ""),
+    smtp_port=int(os.environ.get("EMAIL_SMTP_PORT", "587")),
+    username=os.environ.get("EMAIL_USERNAME", ""),
+    password=os.environ.get("EMAIL_PASSWORD", ""),
+    from_email=os.environ.get("EMAIL_FROM", ""),
+    to_email=os.environ.get("EMAIL_TO", ""),
+    use_tls=os.environ.get("EMAIL_USE_TLS", "true").lower() == "true",
+)
@@ -1,9 +1,15 @@
 import logging
 import asyncio
-from .manager import RSSManager
-from .notifier import notification_manager, TelegramNotifier, EmailNotifier
+from collections import defaultdict
+from .manager import RSSManager, parse_url
+from .notifier import (
+    notification_manager,
+    telegram_dispatcher,
+    chunk_urls,
+    TelegramNotifier,
+    EmailNotifier,
+)
 from pathlib import Path
-from urllib.parse import urlparse
 from core.config import telegram_config
 from telegram import Update, Bot
 from telegram.ext import ContextTypes, CommandHandler, Application
@@ -18,6 +24,8 @@ async def init_notifiers(bot: Bot = None):
         # 注册Telegram通知服务
         telegram_notifier = TelegramNotifier(bot)
         notification_manager.register_notifier("telegram", telegram_notifier)
+        # 启动Telegram发送队列的后台协程
+        telegram_dispatcher.start()
     
     # 注册Email通知服务
     email_notifier = EmailNotifier()
@@ -39,10 +47,12 @@ async def send_update_notification(
         logging.error("未配置发送目标，请检查TELEGRAM_TARGET_CHAT环境变量")
         return
 
-    domain = urlparse(url).netloc
+    domain = parse_url(url).netloc
+    has_file = bool(dated_file and dated_file.exists())
 
     try:
-        if dated_file and dated_file.exists():
+        # 所有消息经由发送队列发送，统一限流并处理 RetryAfter
+        if has_file:
             # 根据是否有新增URL，分别构造美化后的标题
             if new_urls:
                 header_message = (
@@ -59,14 +69,15 @@ async def send_update_notification(
                     f"来源: {url}\n"
                     f"------------------------------------"
                 )
-            await bot.send_document(
+            await telegram_dispatcher.submit(
+                bot.send_document,
                 chat_id=chat_id,
                 document=dated_file,
                 caption=header_message,
             )
             logging.info(f"已发送sitemap文件: {dated_file} for {url}")
             try:
-                dated_file.unlink()  # 发送成功后删除
+                await asyncio.to_thread(dated_file.unlink)  # 发送成功后删除
                 logging.info(f"已删除临时sitemap文件: {dated_file}")
             except OSError as e:
                 logging.error(f"删除文件失败: {dated_file}, Error: {str(e)}")
@@ -74,7 +85,8 @@ async def send_update_notification(
             # 没有文件时，发送美化标题文本
             if not new_urls:
                 message = f"✅ {domain} 今日没有更新"
-                await bot.send_message(
+                await telegram_dispatcher.submit(
+                    bot.send_message,
                     chat_id=chat_id, text=message, disable_web_page_preview=True
                 )
             else:
@@ -84,27 +96,27 @@ async def send_update_notification(
                     f"发现新增内容！ (共 {len(new_urls)} 条)\n"
                     f"来源: {url}\n"
                 )
-                await bot.send_message(
+                await telegram_dispatcher.submit(
+                    bot.send_message,
                     chat_id=chat_id, text=header_message, disable_web_page_preview=True
                 )
 
-        await asyncio.sleep(1)
         if new_urls:
             logging.info(f"开始发送 {len(new_urls)} 个新URL for {domain}")
-            for u in new_urls:
-                await bot.send_message(
-                    chat_id=chat_id, text=u, disable_web_page_preview=False
+            # 将多个URL合并为一条消息发送，减少API调用次数
+            for chunk in chunk_urls(new_urls):
+                await telegram_dispatcher.submit(
+                    bot.send_message,
+                    chat_id=chat_id, text=chunk, disable_web_page_preview=True
                 )
-                logging.info(f"已发送URL: {u}")
-                await asyncio.sleep(1)
             logging.info(f"已发送 {len(new_urls)} 个新URL for {domain}")
 
             # 发送更新结束的消息
-            await asyncio.sleep(1)
             end_message = (
                 f"✨ {domain} 更新推送完成 ✨\n------------------------------------"
             )
-            await bot.send_message(
+            await telegram_dispatcher.submit(
+                bot.send_message,
                 chat_id=chat_id, text=end_message, disable_web_page_preview=True
             )
             logging.info(f"已发送更新结束消息 for {domain}")
@@ -176,7 +188,7 @@ async def rss_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
             if "今天已经更新过此sitemap" in error_msg:
                 # 获取当前文件并发送给用户 (这部分是发送给命令发起者的，逻辑保持)
                 try:
-                    domain = urlparse(url).netloc
+                    domain = parse_url(url).netloc
                     current_file = (
                         rss_manager.sitemap_dir / domain / "sitemap-current.xml"
                     )
@@ -187,15 +199,9 @@ async def rss_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
                             caption=f"今天的Sitemap文件\nURL: {url}",
                         )
                         await notification_manager.send_to_all("send_message", message=f"该sitemap今天已经更新过")
-                        # 即使今天更新过，也尝试给频道发送一次通知（可能包含上次比较的结果）
-                        # 注意：这里 dated_file 可能不存在，需要处理
-                        _, _, dated_file_maybe, existing_new_urls = (
-                            rss_manager.download_sitemap(url)
-                        )  # 再次调用以获取文件和URL
-                        if dated_file_maybe:
-                            await send_update_notification(
-                                context.bot, url, existing_new_urls, dated_file_maybe
-                            )
+                        # 即使今天更新过，也给频道发送一次通知。走到这里说明今天的
+                        # 带日期文件已经发送并删除，当天的更新已推送过，因此只发送无更新消息
+                        await send_update_notification(context.bot, url, [], None)
 
                     else:
                         await notification_manager.send_to_all("send_message", message=f"该sitemap今天已经更新过")
@@ -240,6 +246,30 @@ def register_commands(application: Application):
     application.add_handler(CommandHandler("news", force_summary_command_handler))
 
 
+def _diff_stored_sitemap(feed_url: str) -> list[str]:
+    """比较 feed 已存储的 current 和 latest sitemap 文件，返回新增的URL列表"""
+    domain = parse_url(feed_url).netloc
+    domain_dir = rss_manager.sitemap_dir / domain
+    current_sitemap_file = domain_dir / "sitemap-current.xml"
+    # 'latest_sitemap_file' actually stores the sitemap content from the run *before* 'current_sitemap_file' was updated.
+    # So it's the 'old' or 'previous' sitemap.
+    latest_sitemap_file = domain_dir / "sitemap-latest.xml"
+
+    current_exists = current_sitemap_file.exists()
+    latest_exists = latest_sitemap_file.exists()
+    if not (current_exists and latest_exists):
+        logging.warning(f"强制汇总 - 对于 {feed_url}，current ({current_exists}) 或 latest ({latest_exists}) sitemap 文件不存在，跳过比较。")
+        return []
+
+    # compare_sitemap_files expects (new_file, old_file); files are stream-parsed, not read into memory
+    new_urls_for_feed = rss_manager.compare_sitemap_files(current_sitemap_file, latest_sitemap_file)
+    if new_urls_for_feed:
+        logging.info(f"强制汇总 - 为 {domain} 从 current/latest 文件比较中发现 {len(new_urls_for_feed)} 个新 URL。")
+    else:
+        logging.info(f"强制汇总 - 为 {domain} 从 current/latest 文件比较中未发现新 URL。")
+    return new_urls_for_feed
+
+
 async def force_send_keywords_summary(bot: Bot, target_chat: str = None) -> None:
     """
     强制从存储的 current 和 latest sitemap 文件比对生成并发送关键词汇总。
@@ -261,31 +291,16 @@ async def force_send_keywords_summary(bot: Bot, target_chat: str = None) -> None
         return
 
     logging.info(f"开始为 {len(feeds)} 个 feeds 强制生成关键词汇总。")
-    for feed_url in feeds:
-        try:
-            domain = urlparse(feed_url).netloc
-            domain_dir = rss_manager.sitemap_dir / domain
-            current_sitemap_file = domain_dir / "sitemap-current.xml"
-            # 'latest_sitemap_file' actually stores the sitemap content from the run *before* 'current_sitemap_file' was updated.
-            # So it's the 'old' or 'previous' sitemap.
-            latest_sitemap_file = domain_dir / "sitemap-latest.xml"
-
-            if current_sitemap_file.exists() and latest_sitemap_file.exists():
-                current_content = current_sitemap_file.read_text()
-                latest_content = latest_sitemap_file.read_text() # This is the 'old' content
-
-                # rss_manager.compare_sitemaps expects (new_content, old_content)
-                new_urls_for_feed = rss_manager.compare_sitemaps(current_content, latest_content)
-                if new_urls_for_feed:
-                    logging.info(f"强制汇总 - 为 {domain} 从 current/latest 文件比较中发现 {len(new_urls_for_feed)} 个新 URL。")
-                    all_new_urls_for_summary.extend(new_urls_for_feed)
-                else:
-                    logging.info(f"强制汇总 - 为 {domain} 从 current/latest 文件比较中未发现新 URL。")
-            else:
-                logging.warning(f"强制汇总 - 对于 {feed_url}，current ({current_sitemap_file.exists()}) 或 latest ({latest_sitemap_file.exists()}) sitemap 文件不存在，跳过比较。")
-        except Exception as e:
-            logging.error(f"强制汇总 - 处理 feed {feed_url} 时出错: {str(e)}")
+    # 各 feed 的文件读取和比较互不依赖，放到线程中并发执行
+    results = await asyncio.gather(
+        *(asyncio.to_thread(_diff_stored_sitemap, feed_url) for feed_url in feeds),
+        return_exceptions=True,
+    )
+    for feed_url, result in zip(feeds, results):
+        if isinstance(result, Exception):
+            logging.error(f"强制汇总 - 处理 feed {feed_url} 时出错: {str(result)}")
             continue
+        all_new_urls_for_summary.extend(result)
 
     if all_new_urls_for_summary:
         logging.info(f"强制汇总 - 共收集到 {len(all_new_urls_for_summary)} 个新 URL 用于生成汇总。")
@@ -341,47 +356,39 @@ async def send_keywords_summary(
     if not all_new_urls:
         return
 
-    # 创建域名-关键词映射字典
-    domain_keywords = {}
+    # 创建域名-关键词映射字典，使用集合自动去重
+    domain_keywords = defaultdict(set)
 
-    # 从URL中提取域名和关键词
-    for url in all_new_urls:
-        try:
+    # 从URL中提取域名和关键词，重复的URL只处理一次
+    try:
+        for url in dict.fromkeys(all_new_urls):
+            if not isinstance(url, str) or "://" not in url:
+                continue
             # 解析URL获取域名和路径
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc
+            parsed_url = parse_url(url)
 
             # 提取路径最后部分作为关键词
-            path_parts = parsed_url.path.rstrip("/").split("/")
-            if path_parts and path_parts[-1]:  # 确保有路径且最后部分不为空
-                keyword = path_parts[-1]
-                if keyword.strip():
-                    # 将关键词添加到对应域名的列表中
-                    if domain not in domain_keywords:
-                        domain_keywords[domain] = []
-                    domain_keywords[domain].append(keyword)
-        except Exception as e:
-            logging.debug(f"从URL提取关键词失败: {url}, 错误: {str(e)}")
-            continue
-
-    # 对每个域名的关键词列表去重
-    for domain in domain_keywords:
-        domain_keywords[domain] = list(set(domain_keywords[domain]))
+            keyword = parsed_url.path.rstrip("/").rpartition("/")[2].strip()
+            if keyword:
+                domain_keywords[parsed_url.netloc].add(keyword)
+    except Exception as e:
+        logging.error(f"从URL提取关键词失败: {str(e)}")
 
     # 如果有关键词，构建并发送消息
     if domain_keywords:
         # 构建今日新增关键词消息，按域名分组
-        summary_message = (
+        parts = [
             "━━━━━━━━━━━━━━━━━━\n" "🎯 #今日新增 #关键词 #速览 🎯\n" "━━━━━━━━━━━━━━━━━━\n\n"
-        )
+        ]
 
         # 按域名分组展示关键词
         for domain, keywords in domain_keywords.items():
             if keywords:  # 确保该域名有关键词
-                summary_message += f"📌 {domain}:\n"
-                for i, keyword in enumerate(keywords, 1):
-                    summary_message += f"  {i}. {keyword}\n"
-                summary_message += "\n"  # 域名之间添加空行分隔
+                parts.append(f"📌 {domain}:\n")
+                parts.extend(f"  {i}. {keyword}\n" for i, keyword in enumerate(keywords, 1))
+                parts.append("\n")  # 域名之间添加空行分隔
+
+        summary_message = "".join(parts)
 
         # 发送汇总消息
         try:
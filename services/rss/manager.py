@@ -1,10 +1,35 @@
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from urllib.parse import urlparse
+from urllib.parse import urlparse, ParseResult
+from xml.etree import ElementTree as ET
 import requests
 
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+
+@lru_cache(maxsize=8192)
+def parse_url(url: str) -> ParseResult:
+    """解析URL并缓存结果，同一URL在通知和汇总中会被多次解析"""
+    return urlparse(url)
+
+
+def sitemap_url_set(path: Path) -> frozenset[str]:
+    """流式解析sitemap文件，返回其中所有 <url><loc> 的集合
+
+    逐个处理 <url> 元素并随即清空，不构建完整的文档树。
+    """
+    urls = set()
+    for _, elem in ET.iterparse(path, events=("end",)):
+        if elem.tag == SITEMAP_NS + "url":
+            loc = elem.find(SITEMAP_NS + "loc")
+            if loc is not None:
+                urls.add(loc.text)
+            elem.clear()
+    return frozenset(urls)
+
 
 class RSSManager:
     def __init__(self):
@@ -33,7 +58,7 @@ class RSSManager:
         try:
             # 获取域名作为目录名
             logging.info(f"尝试下载sitemap: {url}")
-            domain = urlparse(url).netloc
+            domain = parse_url(url).netloc
             domain_dir = self.sitemap_dir / domain
             domain_dir.mkdir(parents=True, exist_ok=True)
 
@@ -169,11 +194,17 @@ class RSSManager:
             logging.error("读取feeds文件失败", exc_info=True)
             return []
 
+    def compare_sitemap_files(self, current_file: Path, old_file: Path) -> list[str]:
+        """比较本地保存的新旧sitemap文件，返回新增的URL列表"""
+        try:
+            return list(sitemap_url_set(current_file) - sitemap_url_set(old_file))
+        except Exception as e:
+            logging.error(f"比较sitemap失败: {str(e)}")
+            return []
+
     def compare_sitemaps(self, current_content: str, old_content: str) -> list[str]:
         """比较新旧sitemap，返回新增的URL列表"""
         try:
-            from xml.etree import ElementTree as ET
-
             current_root = ET.fromstring(current_content)
             old_root = ET.fromstring(old_content)
 
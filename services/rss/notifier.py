@@ -1,8 +1,196 @@
+import html
 import logging
+import asyncio
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
 from pathlib import Path
-from urllib.parse import urlparse
-from typing import Optional, List, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
 from abc import ABC, abstractmethod
+from telegram import InputFile
+from telegram.error import RetryAfter, TelegramError
+from core.config import telegram_config, email_config
+from apps.email_bot import send_email, send_update_notification as email_send_notification
+from .manager import parse_url
+
+logger = logging.getLogger(__name__)
+
+# Telegram单条消息长度上限为4096字符，预留一些余量
+TELEGRAM_MESSAGE_LIMIT = 4000
+
+# Telegram向同一群组/频道发送消息的频率限制 (每分钟约20条)
+TELEGRAM_CHAT_RATE_LIMIT = 20
+TELEGRAM_CHAT_RATE_PERIOD = 60
+
+# Telegram发送队列的最大长度，队列满时发送方等待
+TELEGRAM_QUEUE_SIZE = 1000
+
+_SEPARATOR = "------------------------------------"
+
+# 通知消息模板
+_HEADER_NEW = (
+    "✨ {domain} ✨\n"
+    f"{_SEPARATOR}\n"
+    "发现新增内容！ (共 {n} 条)\n"
+    "来源: {url}\n"
+)
+_HEADER_NONE = (
+    "✅ {domain}\n"
+    f"{_SEPARATOR}\n"
+    "{domain} 今日sitemap无更新\n"
+    "来源: {url}\n"
+    f"{_SEPARATOR}"
+)
+_NO_UPDATE_MESSAGE = "✅ {domain} 今日没有更新"
+_END_MESSAGE = "✨ {domain} 更新推送完成 ✨\n" + _SEPARATOR
+_DIGEST_HEADER = "✅ 今日无更新 (共 {n} 个站点):\n"
+
+# 未配置发送目标时的错误日志
+_NO_TELEGRAM_TARGET_ERROR = "未配置发送目标，请检查TELEGRAM_TARGET_CHAT环境变量"
+_NO_EMAIL_TARGET_ERROR = "未配置邮件接收地址，请检查EMAIL_TO环境变量"
+
+_EMAIL_HTML_TEMPLATE = (
+    "<html><body><pre>{message}</pre><hr>"
+    "<p><em>自动发送 by Email Bot</em></p></body></html>"
+)
+
+
+def retry_after_seconds(error: RetryAfter) -> float:
+    """获取 RetryAfter 中需要等待的秒数，兼容 int 和 timedelta 两种形式"""
+    retry_after = error.retry_after
+    if hasattr(retry_after, "total_seconds"):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+def chunk_urls(urls: List[str], max_chars: int = TELEGRAM_MESSAGE_LIMIT) -> Iterator[str]:
+    """将URL按行合并为不超过 max_chars 的消息文本"""
+    chunk: List[str] = []
+    size = 0
+    for u in urls:
+        # 加上换行符的长度
+        if chunk and size + len(u) + 1 > max_chars:
+            yield "\n".join(chunk)
+            chunk, size = [], 0
+        chunk.append(u)
+        size += len(u) + 1
+    if chunk:
+        yield "\n".join(chunk)
+
+
+class RateLimiter:
+    """滑动窗口限流器，任意 period 秒内最多放行 n 次
+
+    记录最近的放行时间，未达到上限时立即返回，只有窗口已满才等待最早一次放行过期。
+    """
+
+    def __init__(self, n: int, period: float):
+        self.n = n
+        self.period = period
+        self.times: deque = deque()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """暂停放行 seconds 秒，用于响应服务端的限流提示"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        """获取一次放行，窗口已满或处于暂停期时等待"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                # 移除窗口之外的放行记录
+                while self.times and self.times[0] <= now - self.period:
+                    self.times.popleft()
+                if len(self.times) < self.n:
+                    self.times.append(now)
+                    return
+                await asyncio.sleep(self.times[0] + self.period - now)
+
+
+@dataclass
+class SendJob:
+    """一次待发送的Telegram API调用"""
+
+    send: Callable[..., Awaitable[Any]]
+    kwargs: Dict[str, Any]
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class TelegramDispatcher:
+    """进程内共享的Telegram发送队列
+
+    所有通知服务把发送请求放入同一个队列，由单个后台协程按限流节奏依次发送，
+    避免多个站点同时更新时各自发送而触发Telegram的频率限制。
+    """
+
+    def __init__(self, maxsize: int = TELEGRAM_QUEUE_SIZE):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        # chat_id -> 限流器，Telegram的频率限制按群组/频道分别计算
+        self.rate_limiters: Dict[Any, RateLimiter] = {}
+        self._worker_task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """启动后台发送协程，重复调用无副作用"""
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = asyncio.create_task(self._worker())
+
+    def rate_limiter(self, chat_id: Any) -> RateLimiter:
+        """获取发送目标对应的限流器，不存在时创建"""
+        limiter = self.rate_limiters.get(chat_id)
+        if limiter is None:
+            limiter = self.rate_limiters[chat_id] = RateLimiter(
+                TELEGRAM_CHAT_RATE_LIMIT, TELEGRAM_CHAT_RATE_PERIOD
+            )
+        return limiter
+
+    async def enqueue(self, send: Callable[..., Awaitable[Any]], **kwargs) -> SendJob:
+        """把一次发送放入队列后立即返回，通过 wait 等待其完成"""
+        self.start()
+        job = SendJob(send=send, kwargs=kwargs)
+        await self.queue.put(job)
+        return job
+
+    @staticmethod
+    async def wait(job: SendJob) -> Any:
+        """等待发送完成并返回发送结果，发送失败时抛出对应异常"""
+        await job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    async def submit(self, send: Callable[..., Awaitable[Any]], **kwargs) -> Any:
+        """提交一次发送并等待其完成，发送失败时抛出对应异常"""
+        return await self.wait(await self.enqueue(send, **kwargs))
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self.queue.get()
+            rate_limiter = self.rate_limiter(job.kwargs.get("chat_id"))
+            try:
+                while True:
+                    # 同时遵守整个Bot的全局限流和发送目标的频率限制
+                    await telegram_rate_limiter.acquire()
+                    await rate_limiter.acquire()
+                    try:
+                        job.result = await job.send(**job.kwargs)
+                        break
+                    except RetryAfter as e:
+                        # 原地重试以保持消息顺序
+                        seconds = retry_after_seconds(e)
+                        logger.warning("Telegram限流，%s 秒后重试", seconds)
+                        rate_limiter.pause(seconds)
+            except Exception as e:
+                job.error = e
+            finally:
+                job.done.set()
+                self.queue.task_done()
 
 
 class NotificationService(ABC):
@@ -14,15 +202,20 @@ class NotificationService(ABC):
         url: str,
         new_urls: List[str],
         dated_file: Optional[Path],
-        target: Optional[str] = None
+        target: Optional[str] = None,
+        delete_file: bool = True
     ) -> None:
-        """发送更新通知"""
+        """发送更新通知，delete_file 为 False 时由调用方负责删除 dated_file"""
         pass
     
     @abstractmethod
     async def send_message(self, message: str, target: Optional[str] = None) -> None:
         """发送普通消息"""
         pass
+    
+    async def flush_digest(self) -> None:
+        """发送累积的汇总消息，默认无操作"""
+        pass
 
 
 class TelegramNotifier(NotificationService):
@@ -30,155 +223,259 @@ class TelegramNotifier(NotificationService):
     
     def __init__(self, bot):
         self.bot = bot
-        from core.config import telegram_config
+        # 发送方法在初始化时绑定一次，避免每次发送时重复属性查找
+        self._send_message = bot.send_message
+        self._send_document = bot.send_document
         self.config = telegram_config
+        # 默认发送目标在初始化时解析一次
+        self._default_chat_id = self.config.get("target_chat")
+        # chat_id -> 本轮无更新的站点域名，由 flush_digest 合并发送
+        self._empty_domains: Dict[Any, List[str]] = defaultdict(list)
+    
+    async def _queue_sitemap(
+        self, chat_id: str, dated_file: Path, caption: str
+    ) -> Optional[SendJob]:
+        """读取sitemap文件并放入发送队列；文件不存在时改为发送标题文本并返回 None"""
+        try:
+            # 在线程中读取文件，避免大文件读取阻塞事件循环
+            data = await asyncio.to_thread(dated_file.read_bytes)
+        except FileNotFoundError as e:
+            logger.warning("读取sitemap文件失败，改为发送文本: %s, Error: %s", dated_file, e)
+            await telegram_dispatcher.submit(
+                self._send_message,
+                chat_id=chat_id,
+                text=caption,
+                disable_web_page_preview=True,
+            )
+            return None
+        return await telegram_dispatcher.enqueue(
+            self._send_document_or_caption,
+            chat_id=chat_id,
+            document=InputFile(data, filename=dated_file.name),
+            caption=caption,
+        )
+    
+    async def _send_document_or_caption(
+        self, chat_id: str, document: InputFile, caption: str
+    ) -> bool:
+        """发送文件，上传失败时改为发送标题文本，返回文件是否发送成功
+
+        回退在同一个发送任务中完成：URL消息可能已在队列中排在文件之后，
+        这样标题仍然出现在URL之前。
+        """
+        try:
+            await self._send_document(chat_id=chat_id, document=document, caption=caption)
+            return True
+        except RetryAfter:
+            # 交给发送队列原地重试
+            raise
+        except TelegramError as e:
+            logger.warning("发送sitemap文件失败，改为发送文本: %s, Error: %s", document.filename, e)
+        await self._send_message(
+            chat_id=chat_id, text=caption, disable_web_page_preview=True
+        )
+        return False
+    
+    async def _finish_sitemap(
+        self,
+        job: Optional[SendJob],
+        dated_file: Path,
+        url: str,
+        delete_file: bool,
+    ) -> None:
+        """等待sitemap文件发送完成，按需删除；上传失败时只发送了标题文本，保留文件"""
+        if job is None or not await telegram_dispatcher.wait(job):
+            return
+        logger.info("已发送sitemap文件: %s for %s", dated_file, url)
+        if not delete_file:
+            return
+        try:
+            await asyncio.to_thread(dated_file.unlink)  # 发送成功后删除
+            logger.info("已删除临时sitemap文件: %s", dated_file)
+        except OSError as e:
+            logger.error("删除文件失败: %s, Error: %s", dated_file, e)
+    
+    async def _send_urls(self, chat_id: str, text: str) -> None:
+        """通过发送队列发送一条包含多个URL的消息"""
+        try:
+            await telegram_dispatcher.submit(
+                self._send_message,
+                chat_id=chat_id,
+                text=text,
+                disable_web_page_preview=False,
+            )
+            # 每批URL只记录调试日志，发送总数由调用方汇总记录
+            logger.debug("已发送URL:\n%s", text)
+        except Exception as e:
+            logger.error("发送URL失败: %s, Error: %s", text, e)
     
     async def send_update_notification(
         self,
         url: str,
         new_urls: List[str],
         dated_file: Optional[Path],
-        target: Optional[str] = None
+        target: Optional[str] = None,
+        delete_file: bool = True
     ) -> None:
         """发送Sitemap更新通知到Telegram"""
-        from telegram import Bot
-        import asyncio
-        
-        chat_id = target or self.config["target_chat"]
+        chat_id = target or self._default_chat_id
         if not chat_id:
-            logging.error("未配置发送目标，请检查TELEGRAM_TARGET_CHAT环境变量")
+            logger.error(_NO_TELEGRAM_TARGET_ERROR)
             return
         
-        domain = urlparse(url).netloc
+        domain = parse_url(url).netloc
+        # 去重一次，标题中的数量、日志和发送的URL保持一致
+        new_urls = list(dict.fromkeys(new_urls))
+        
+        # 无更新的站点不单独发送，记录下来由 flush_digest 合并为一条消息；
+        # 需要本服务删除的文件仍然正常发送，避免文件无人清理
+        if (
+            not new_urls
+            and self.config["skip_empty"]
+            and (dated_file is None or not delete_file)
+        ):
+            self._empty_domains[chat_id].append(domain)
+            return
         
         try:
-            if dated_file and dated_file.exists():
-                # 根据是否有新增URL，分别构造美化后的标题
-                if new_urls:
-                    header_message = (
-                        f"✨ {domain} ✨\n"
-                        f"------------------------------------\n"
-                        f"发现新增内容！ (共 {len(new_urls)} 条)\n"
-                        f"来源: {url}\n"
+            # 发送节奏由发送队列统一控制
+            async with asyncio.TaskGroup() as tg:
+                # 调用方刚写入 dated_file，直接信任其存在，缺失时由 _queue_sitemap 处理
+                if dated_file is not None:
+                    # 根据是否有新增URL，分别构造美化后的标题
+                    if new_urls:
+                        header_message = _HEADER_NEW.format(
+                            domain=domain, n=len(new_urls), url=url
+                        )
+                    else:
+                        header_message = _HEADER_NONE.format(domain=domain, url=url)
+                    # 标题和文件先进入发送队列，保证频道中先看到标题再看到URL
+                    job = await self._queue_sitemap(chat_id, dated_file, header_message)
+                    finish_sitemap = self._finish_sitemap(
+                        job, dated_file, url, delete_file
                     )
+                    if self.config["pipeline_sends"]:
+                        # 不等待文件上传完成，直接把URL放入发送队列
+                        tg.create_task(finish_sitemap)
+                    else:
+                        await finish_sitemap
                 else:
-                    header_message = (
-                        f"✅ {domain}\n"
-                        f"------------------------------------\n"
-                        f"{domain} 今日sitemap无更新\n"
-                        f"来源: {url}\n"
-                        f"------------------------------------"
-                    )
-                await self.bot.send_document(
-                    chat_id=chat_id,
-                    document=dated_file,
-                    caption=header_message,
-                )
-                logging.info(f"已发送sitemap文件: {dated_file} for {url}")
-                try:
-                    dated_file.unlink()  # 发送成功后删除
-                    logging.info(f"已删除临时sitemap文件: {dated_file}")
-                except OSError as e:
-                    logging.error(f"删除文件失败: {dated_file}, Error: {str(e)}")
-            else:
-                # 没有文件时，发送美化标题文本
-                if not new_urls:
-                    message = f"✅ {domain} 今日没有更新"
-                    await self.bot.send_message(
-                        chat_id=chat_id, text=message, disable_web_page_preview=True
-                    )
-                else:
-                    header_message = (
-                        f"✨ {domain} ✨\n"
-                        f"------------------------------------\n"
-                        f"发现新增内容！ (共 {len(new_urls)} 条)\n"
-                        f"来源: {url}\n"
-                    )
-                    await self.bot.send_message(
-                        chat_id=chat_id, text=header_message, disable_web_page_preview=True
-                    )
+                    # 没有文件时，发送美化标题文本
+                    if not new_urls:
+                        message = _NO_UPDATE_MESSAGE.format(domain=domain)
+                        await telegram_dispatcher.submit(
+                            self._send_message,
+                            chat_id=chat_id,
+                            text=message,
+                            disable_web_page_preview=True,
+                        )
+                    else:
+                        header_message = _HEADER_NEW.format(
+                            domain=domain, n=len(new_urls), url=url
+                        )
+                        await telegram_dispatcher.submit(
+                            self._send_message,
+                            chat_id=chat_id,
+                            text=header_message,
+                            disable_web_page_preview=True,
+                        )
+                
+                if new_urls:
+                    logger.info("开始发送 %s 个新URL for %s", len(new_urls), domain)
+                    # 将多个URL合并为一条消息，减少API调用次数
+                    for chunk in chunk_urls(new_urls):
+                        tg.create_task(self._send_urls(chat_id, chunk))
             
-            await asyncio.sleep(1)
             if new_urls:
-                logging.info(f"开始发送 {len(new_urls)} 个新URL for {domain}")
-                for u in new_urls:
-                    await self.bot.send_message(
-                        chat_id=chat_id, text=u, disable_web_page_preview=False
-                    )
-                    logging.info(f"已发送URL: {u}")
-                    await asyncio.sleep(1)
-                logging.info(f"已发送 {len(new_urls)} 个新URL for {domain}")
+                logger.info("已发送 %s 个新URL for %s", len(new_urls), domain)
                 
-                # 发送更新结束的消息
-                await asyncio.sleep(1)
-                end_message = (
-                    f"✨ {domain} 更新推送完成 ✨\n------------------------------------"
-                )
-                await self.bot.send_message(
-                    chat_id=chat_id, text=end_message, disable_web_page_preview=True
+                # 文件和所有URL发送完成后，发送更新结束的消息
+                end_message = _END_MESSAGE.format(domain=domain)
+                await telegram_dispatcher.submit(
+                    self._send_message,
+                    chat_id=chat_id,
+                    text=end_message,
+                    disable_web_page_preview=True,
                 )
-                logging.info(f"已发送更新结束消息 for {domain}")
+                logger.info("已发送更新结束消息 for %s", domain)
         except Exception as e:
-            logging.error(f"发送URL更新消息失败 for {url}: {str(e)}", exc_info=True)
+            logger.error("发送URL更新消息失败 for %s: %s", url, e, exc_info=True)
+    
+    async def flush_digest(self) -> None:
+        """将累积的无更新站点按发送目标合并为一条消息发送"""
+        if not self._empty_domains:
+            return
+        digests, self._empty_domains = self._empty_domains, defaultdict(list)
+        
+        for chat_id, domains in digests.items():
+            domains = list(dict.fromkeys(domains))
+            header = _DIGEST_HEADER.format(n=len(domains))
+            try:
+                for chunk in chunk_urls(domains, TELEGRAM_MESSAGE_LIMIT - len(header)):
+                    await telegram_dispatcher.submit(
+                        self._send_message,
+                        chat_id=chat_id,
+                        text=header + chunk,
+                        disable_web_page_preview=True,
+                    )
+            except Exception as e:
+                logger.error("发送无更新汇总消息失败: %s", e, exc_info=True)
+                continue
+            logger.info("已发送无更新汇总消息，共 %s 个站点", len(domains))
     
     async def send_message(self, message: str, target: Optional[str] = None) -> None:
         """发送普通消息到Telegram"""
-        chat_id = target or self.config["target_chat"]
+        chat_id = target or self._default_chat_id
         if not chat_id:
-            logging.error("未配置发送目标，请检查TELEGRAM_TARGET_CHAT环境变量")
+            logger.error(_NO_TELEGRAM_TARGET_ERROR)
             return
         
         try:
-            await self.bot.send_message(
-                chat_id=chat_id, text=message, disable_web_page_preview=True
+            await telegram_dispatcher.submit(
+                self._send_message,
+                chat_id=chat_id,
+                text=message,
+                disable_web_page_preview=True,
             )
         except Exception as e:
-            logging.error(f"发送Telegram消息失败: {str(e)}", exc_info=True)
+            logger.error("发送Telegram消息失败: %s", e, exc_info=True)
 
 
 class EmailNotifier(NotificationService):
     """Email通知服务"""
     
     def __init__(self):
-        from core.config import email_config
         self.config = email_config
+        # 默认接收地址在初始化时解析一次
+        self._default_to_email = self.config.to_email
     
     async def send_update_notification(
         self,
         url: str,
         new_urls: List[str],
         dated_file: Optional[Path],
-        target: Optional[str] = None
+        target: Optional[str] = None,
+        delete_file: bool = True
     ) -> None:
         """发送Sitemap更新通知邮件"""
-        from apps.email_bot import send_update_notification as email_send_notification
-        
-        email_to = target or self.config["to_email"]
+        email_to = target or self._default_to_email
         if not email_to:
-            logging.error("未配置邮件接收地址，请检查EMAIL_TO环境变量")
+            logger.error(_NO_EMAIL_TARGET_ERROR)
             return
         
-        await email_send_notification(url, new_urls, dated_file, email_to)
+        await email_send_notification(
+            url, new_urls, dated_file, email_to, delete_file=delete_file
+        )
     
     async def send_message(self, message: str, target: Optional[str] = None) -> None:
         """发送普通邮件"""
-        from apps.email_bot import send_email
-        
-        email_to = target or self.config["to_email"]
+        email_to = target or self._default_to_email
         if not email_to:
-            logging.error("未配置邮件接收地址，请检查EMAIL_TO环境变量")
+            logger.error(_NO_EMAIL_TARGET_ERROR)
             return
         
-        # 将纯文本消息转换为HTML格式
-        html_message = f"""
-        <html>
-        <body>
-            <pre>{message}</pre>
-            <hr>
-            <p><em>自动发送 by Email Bot</em></p>
-        </body>
-        </html>
-        """
+        # 将纯文本消息转换为HTML格式，转义消息中的HTML特殊字符
+        html_message = _EMAIL_HTML_TEMPLATE.format(message=html.escape(message))
         
         await send_email("RSS通知", html_message)
 
@@ -188,11 +485,21 @@ class NotificationManager:
     
     def __init__(self):
         self.notifiers: Dict[str, NotificationService] = {}
+        # 通知服务名 -> {方法名: 绑定方法}，注册时预先解析
+        self._dispatch: Dict[str, Dict[str, Callable[..., Awaitable[None]]]] = {}
+        # (通知服务名, 方法表) 的只读快照，注册时重建，发送时直接遍历
+        self._snapshot: tuple = ()
     
     def register_notifier(self, name: str, notifier: NotificationService):
         """注册通知服务"""
         self.notifiers[name] = notifier
-        logging.info(f"已注册通知服务: {name}")
+        self._dispatch[name] = {
+            "send_update_notification": notifier.send_update_notification,
+            "send_message": notifier.send_message,
+            "flush_digest": notifier.flush_digest,
+        }
+        self._snapshot = tuple(self._dispatch.items())
+        logger.info("已注册通知服务: %s", name)
     
     def get_notifier(self, name: str) -> Optional[NotificationService]:
         """获取通知服务"""
@@ -202,17 +509,53 @@ class NotificationManager:
         self,
         method: str,
         *args,
+        exclude: tuple = (),
         **kwargs
     ) -> None:
-        """向所有注册的通知服务发送消息"""
-        for name, notifier in self.notifiers.items():
-            try:
-                if hasattr(notifier, method):
-                    await getattr(notifier, method)(*args, **kwargs)
-                    logging.info(f"已通过 {name} 发送通知")
-            except Exception as e:
-                logging.error(f"通过 {name} 发送通知失败: {str(e)}", exc_info=True)
+        """向所有注册的通知服务并发发送消息，exclude 中的通知服务会被跳过"""
+        calls = []
+        for name, methods in self._snapshot:
+            if name in exclude:
+                continue
+            fn = methods.get(method)
+            if fn:
+                calls.append(self._call_one(name, fn, args, kwargs))
+        await asyncio.gather(*calls, return_exceptions=True)
+    
+    async def flush_digest(self) -> None:
+        """让所有通知服务发送本轮累积的汇总消息，每轮定时检查结束时调用一次
+
+        是否发送了消息由各通知服务自行记录，这里只记录异常。
+        """
+        snapshot = self._snapshot
+        results = await asyncio.gather(
+            *(methods["flush_digest"]() for _, methods in snapshot),
+            return_exceptions=True,
+        )
+        for (name, _), result in zip(snapshot, results):
+            if isinstance(result, Exception):
+                logger.error("通过 %s 发送汇总消息失败: %s", name, result)
+    
+    async def _call_one(
+        self,
+        name: str,
+        fn: Callable[..., Awaitable[None]],
+        args: tuple,
+        kwargs: dict
+    ) -> None:
+        """调用单个通知服务，异常只记录日志，不影响其他通知服务"""
+        try:
+            await fn(*args, **kwargs)
+            logger.info("已通过 %s 发送通知", name)
+        except Exception as e:
+            logger.error("通过 %s 发送通知失败: %s", name, e, exc_info=True)
 
 
 # 全局通知管理器实例
-notification_manager = NotificationManager()
\ No newline at end of file
+notification_manager = NotificationManager()
+
+# 全局Telegram发送队列
+telegram_dispatcher = TelegramDispatcher()
+
+# Telegram全局限流器 (每秒最多30条消息)
+telegram_rate_limiter = RateLimiter(30, 1)
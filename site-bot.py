@@ -1,24 +1,32 @@
 import asyncio
 import logging
+import signal
+from typing import Optional
 from telegram.ext import Application, CommandHandler
+from telegram.request import HTTPXRequest
 from services.rss.commands import rss_command, init_notifiers
-from apps.email_bot import init_task as email_init_task, start_task as email_start_task, scheduled_task as email_scheduled_task
+from apps.email_bot import init_task as email_init_task, start_task as email_start_task, scheduled_task as email_scheduled_task, idle_sweep_task as email_idle_sweep_task, close_all as email_close_all
 
+# Telegram API请求的连接池大小。通知消息由发送队列逐条发送，只占用一个连接，
+# 其余连接供命令回复等直接调用复用
+TELEGRAM_CONNECTION_POOL_SIZE = 8
 
-async def main():
-    """主函数"""
-    # 设置日志
-    logging.basicConfig(
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
-    )
-    
-    # 初始化Telegram Bot
-    from core.config import telegram_config
-    telegram_token = telegram_config["token"]
-    
-    if telegram_token:
-        application = Application.builder().token(telegram_token).build()
-        
+
+async def run_telegram(application: Application, stop_event: asyncio.Event) -> None:
+    """运行Telegram Bot轮询，直到收到退出信号或被取消"""
+    async with application:
+        await application.start()
+        await application.updater.start_polling()
+        try:
+            await stop_event.wait()
+        finally:
+            await application.updater.stop()
+            await application.stop()
+
+
+async def run_services(application: Optional[Application]) -> None:
+    """初始化并运行所有服务，application 为 None 时不启动Telegram Bot"""
+    if application is not None:
         # 初始化通知服务
         await init_notifiers(application.bot)
         
@@ -41,22 +49,76 @@ async def main():
         logging.info("Discord Bot已启动")
     
     # 初始化Email Bot
+    email_ready = False
     try:
-        await email_init_task()
-        await email_start_task()
-        asyncio.create_task(email_scheduled_task())
+        # 初始化和启动互不依赖，并发执行
+        await asyncio.gather(email_init_task(), email_start_task())
+        email_ready = True
         logging.info("Email Bot已启动")
     except Exception as e:
         logging.error(f"Email Bot初始化失败: {str(e)}")
     
-    # 启动Telegram Bot（如果配置了）
+    # 收到退出信号后统一取消所有长期运行的服务
+    stop_event = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop_event.set)
+    except NotImplementedError:
+        # Windows 不支持 add_signal_handler
+        pass
+    
+    try:
+        # 任一服务异常退出时，TaskGroup 会取消其余服务并抛出异常
+        async with asyncio.TaskGroup() as tg:
+            tasks = []
+            if email_ready:
+                tasks.append(tg.create_task(email_scheduled_task()))
+                tasks.append(tg.create_task(email_idle_sweep_task()))
+            
+            # 启动Telegram Bot（如果配置了）
+            if application is not None:
+                tasks.append(tg.create_task(run_telegram(application, stop_event)))
+            else:
+                # 如果没有配置Telegram Bot，挂起等待退出信号，保持程序运行
+                logging.info("未配置Telegram Bot，程序将持续运行以支持其他服务")
+            
+            await stop_event.wait()
+            logging.info("收到退出信号，正在停止所有服务")
+            for task in tasks:
+                task.cancel()
+    finally:
+        # 退出时释放邮件连接池
+        await email_close_all()
+
+
+async def main():
+    """主函数"""
+    # 设置日志
+    logging.basicConfig(
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
+    )
+    
+    # 初始化Telegram Bot
+    from core.config import telegram_config
+    telegram_token = telegram_config["token"]
+    
+    application = None
     if telegram_token:
-        await application.run_polling()
-    else:
-        # 如果没有配置Telegram Bot，保持程序运行
-        logging.info("未配置Telegram Bot，程序将持续运行以支持其他服务")
-        while True:
-            await asyncio.sleep(3600)  # 每小时检查一次
+        # 普通API调用使用较大的连接池；getUpdates长轮询单独使用一个请求实例
+        request = HTTPXRequest(
+            connection_pool_size=TELEGRAM_CONNECTION_POOL_SIZE,
+            pool_timeout=10,
+            connect_timeout=10,
+            read_timeout=30,
+        )
+        application = (
+            Application.builder()
+            .token(telegram_token)
+            .request(request)
+            .get_updates_request(HTTPXRequest())
+            .build()
+        )
+    
+    await run_services(application)
 
 
 if __name__ == "__main__":